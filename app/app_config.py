@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -9,11 +10,18 @@ class Settings:
     VARIABLES_DIR = "variables"
     RESULTS_DIR = "results"
 
+    # токен API GitLab/GitHub для запроса списка изменённых файлов (опционально);
+    # используется только для https-хоста из REPO_URL
+    GIT_API_TOKEN = os.environ.get("GIT_API_TOKEN")
+
     # корневая директория, в которой находятся модули app и templates
     package_root = Path(__file__).resolve().parent.parent
 
     temp_dir = package_root / "temp"
 
+    # SQLite база очереди задач генерации (переживает перезапуск сервиса)
+    jobs_db_path = temp_dir / "jobs.sqlite3"
+
     # локальная директория для репозитория
     repo_root = temp_dir / REMOTE_REPO_NAME
     variables_path = repo_root / VARIABLES_DIR
@@ -0,0 +1,340 @@
+"""Офлайн запуск генераторов над локальной копией репозитория конфигураций.
+
+Не требует вебхука, клонирования и push: генераторы из get_generators()
+запускаются над любой директорией, содержащей variables/.
+
+    python -m app.config_generator.cli /path/to/config_templates --jobs 8
+    python -m app.config_generator.cli . --sites s1 s2 --generators vty_acl --diff
+    python -m app.config_generator.cli . --check
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import difflib
+import filecmp
+import logging
+import os
+from pathlib import Path
+import sys
+import tempfile
+from typing import Optional
+
+from app.app_config import settings
+from app.config_generator.core import (
+    ConfigGenerator,
+    get_generator_name,
+    get_generators,
+)
+from app.config_generator.io_utils import list_all_sites
+from app.config_generator.render import remove_stale_temp_files
+from app.logger import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# коды возврата
+EXIT_OK = 0
+EXIT_STALE = 1
+EXIT_ERROR = 2
+
+
+def _init_worker(level: int) -> None:
+    # логи дочерних процессов не должны попадать в stdout (там может быть diff)
+    setup_logging(level, stream=sys.stderr)
+
+
+def _run_slice(
+    gen: ConfigGenerator, variables_path: Path, results_path: Path, sites: list[str]
+) -> None:
+    gen.generate_config(
+        variables_path=variables_path, results_path=results_path, sites=sites
+    )
+
+
+def _split_sites(sites: list[str], parts: int) -> list[list[str]]:
+    """Делит список сайтов на parts непрерывных частей примерно равного размера."""
+    parts = max(1, min(parts, len(sites)))
+    size, extra = divmod(len(sites), parts)
+    slices: list[list[str]] = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(sites[start:end])
+        start = end
+    return slices
+
+
+def _slice_label(gen: ConfigGenerator, sites: list[str]) -> str:
+    if len(sites) == 1:
+        return f"{get_generator_name(gen)} [{sites[0]}]"
+    return f"{get_generator_name(gen)} [{sites[0]}..{sites[-1]}]"
+
+
+def discover_sites(variables_path: Path) -> list[str]:
+    """Возвращает имена всех сайтов из variables/<тип переменных>/<сайт>/."""
+    sites: set[str] = set()
+    for entry in variables_path.iterdir():
+        if entry.is_dir():
+            sites.update(list_all_sites(entry))
+    return sorted(sites)
+
+
+def run_generators(
+    generators: list[ConfigGenerator],
+    sites: list[str],
+    variables_path: Path,
+    results_path: Path,
+    jobs: int = 1,
+) -> list[str]:
+    """Запускает генераторы для сайтов, распределяя части списка сайтов по процессам.
+
+    Ошибка генератора прерывает обработку его части; в сообщении указан
+    диапазон сайтов части, а текст ошибки генератора содержит путь к файлу.
+
+    Args:
+        generators: Генераторы для запуска
+        sites: Имена сайтов
+        variables_path: Директория с переменными
+        results_path: Директория для результатов
+        jobs: Количество параллельных процессов
+
+    Returns:
+        Список сообщений об ошибках (пустой при успехе)
+    """
+    if not sites:
+        return []
+    # каждый генератор получает jobs частей списка сайтов: один вызов
+    # generate_config() на часть, а не на каждый сайт
+    tasks = [(gen, chunk) for gen in generators for chunk in _split_sites(sites, jobs)]
+    errors: list[str] = []
+
+    if jobs <= 1:
+        for gen, chunk in tasks:
+            try:
+                _run_slice(gen, variables_path, results_path, chunk)
+            except Exception as exc:
+                errors.append(f"{_slice_label(gen, chunk)}: {exc}")
+        return errors
+
+    level = logging.getLogger().level
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(level,)
+    ) as pool:
+        futures = {
+            pool.submit(_run_slice, gen, variables_path, results_path, chunk): (
+                gen,
+                chunk,
+            )
+            for gen, chunk in tasks
+        }
+        for future, (gen, chunk) in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                errors.append(f"{_slice_label(gen, chunk)}: {exc}")
+    return errors
+
+
+def compare_results(
+    generated_path: Path, results_path: Path, show_diff: bool = False
+) -> list[str]:
+    """Сравнивает сгенерированные файлы с содержимым results/.
+
+    Args:
+        generated_path: Директория со свежесгенерированными файлами
+        results_path: Директория results/ репозитория
+        show_diff: Выводить unified diff в stdout
+
+    Returns:
+        Относительные пути файлов, отличающихся от results/ или отсутствующих в нём
+    """
+    stale: list[str] = []
+    for generated in sorted(p for p in generated_path.rglob("*") if p.is_file()):
+        rel = generated.relative_to(generated_path).as_posix()
+        current = results_path / rel
+        if current.is_file() and filecmp.cmp(generated, current, shallow=False):
+            continue
+        stale.append(rel)
+        if show_diff:
+            old_lines = (
+                current.read_text(encoding="utf-8").splitlines(keepends=True)
+                if current.is_file()
+                else []
+            )
+            new_lines = generated.read_text(encoding="utf-8").splitlines(keepends=True)
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    old_lines,
+                    new_lines,
+                    fromfile=f"a/{settings.RESULTS_DIR}/{rel}",
+                    tofile=f"b/{settings.RESULTS_DIR}/{rel}",
+                )
+            )
+    return stale
+
+
+def find_orphaned_results(
+    generated_path: Path,
+    results_path: Path,
+    generators: list[ConfigGenerator],
+    sites: Optional[list[str]] = None,
+    show_diff: bool = False,
+) -> list[str]:
+    """Находит файлы в results/, подходящие под output_globs генераторов, но не созданные.
+
+    Например, результат сайта, директория переменных которого удалена.
+
+    Args:
+        generated_path: Директория со свежесгенерированными файлами
+        results_path: Директория results/ репозитория
+        generators: Запущенные генераторы
+        sites: Если задано, проверяются только результаты этих сайтов
+        show_diff: Выводить diff удаления в stdout
+
+    Returns:
+        Относительные пути лишних файлов в results/
+    """
+    orphans: set[str] = set()
+    for gen in generators:
+        for pattern in gen.output_globs:
+            if sites is None:
+                candidates = results_path.glob(pattern)
+            else:
+                candidates = (results_path / pattern.replace("*", s) for s in sites)
+            for current in candidates:
+                rel = current.relative_to(results_path).as_posix()
+                if current.is_file() and not (generated_path / rel).is_file():
+                    orphans.add(rel)
+
+    for rel in sorted(orphans):
+        if show_diff:
+            old_lines = (results_path / rel).read_text(encoding="utf-8")
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    old_lines.splitlines(keepends=True),
+                    [],
+                    fromfile=f"a/{settings.RESULTS_DIR}/{rel}",
+                    tofile="/dev/null",
+                )
+            )
+    return sorted(orphans)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.config_generator.cli",
+        description="Генерация конфигураций по локальной копии репозитория.",
+    )
+    parser.add_argument(
+        "repo",
+        nargs="?",
+        default=".",
+        help=f"Директория, содержащая {settings.VARIABLES_DIR}/ (по умолчанию текущая)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Количество параллельных процессов (по умолчанию число CPU)",
+    )
+    parser.add_argument("--sites", nargs="+", help="Генерировать только эти сайты")
+    parser.add_argument(
+        "--generators",
+        nargs="+",
+        help="Запускать только эти генераторы (имя в templates/)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help=f"Директория для результатов (по умолчанию <repo>/{settings.RESULTS_DIR})",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help=f"Вывести diff относительно {settings.RESULTS_DIR}/ в stdout, не изменяя его",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help=(
+            f"Завершиться с кодом {EXIT_STALE}, если {settings.RESULTS_DIR}/ устарел "
+            "(отличающиеся, отсутствующие или лишние файлы)"
+        ),
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Выводить только предупреждения"
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    repo_path = Path(args.repo).resolve()
+    variables_path = repo_path / settings.VARIABLES_DIR
+    results_path = repo_path / settings.RESULTS_DIR
+    if not variables_path.is_dir():
+        parser.error(f"Не найдена директория {variables_path}")
+
+    level = logging.WARNING if args.quiet else logging.INFO
+    setup_logging(level, stream=sys.stderr)
+
+    generators = get_generators()
+    if args.generators:
+        unknown = set(args.generators) - {get_generator_name(g) for g in generators}
+        if unknown:
+            parser.error(f"Неизвестные генераторы: {', '.join(sorted(unknown))}")
+        generators = [g for g in generators if get_generator_name(g) in args.generators]
+
+    sites = discover_sites(variables_path)
+    if args.sites:
+        unknown = set(args.sites) - set(sites)
+        if unknown:
+            logger.warning(
+                f"Сайты не найдены в variables: {', '.join(sorted(unknown))}"
+            )
+        sites = [site for site in sites if site in args.sites]
+
+    compare = args.check or args.diff
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.output:
+            output_path = Path(args.output).resolve()
+        elif compare:
+            output_path = Path(tmp_dir)
+        else:
+            output_path = results_path
+
+        removed = remove_stale_temp_files(output_path)
+        if removed:
+            logger.info(f"Удалено временных файлов прерванного запуска: {removed}")
+
+        errors = run_generators(
+            generators, sites, variables_path, output_path, jobs=args.jobs
+        )
+        if errors:
+            for msg in errors:
+                logger.error(msg)
+            return EXIT_ERROR
+
+        if compare:
+            stale = compare_results(output_path, results_path, show_diff=args.diff)
+            stale += find_orphaned_results(
+                output_path,
+                results_path,
+                generators,
+                sites=args.sites,
+                show_diff=args.diff,
+            )
+            if stale:
+                logger.warning(
+                    f"{settings.RESULTS_DIR}/ устарел, отличаются файлы: {len(stale)}"
+                )
+                if args.check:
+                    return EXIT_STALE
+
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
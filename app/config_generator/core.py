@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 import importlib
 import inspect
+from typing import Optional
 from app.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,14 +18,40 @@ class ConfigGenerator(ABC):
     - template_dir: Path - директория с шаблонами
     - template_name: str - имя шаблона
     - variables_dir: Path - директория с переменными
+
+    Атрибут input_globs перечисляет glob-шаблоны путей (относительно корня
+    репозитория конфигураций), изменение которых может повлиять на результат
+    генератора. None означает, что генератор зависит от любых изменений.
+
+    Атрибут output_globs перечисляет glob-шаблоны создаваемых файлов
+    (относительно директории результатов); '*' в шаблоне соответствует имени сайта.
     """
 
+    input_globs: Optional[list[str]] = None
+    output_globs: list[str] = []
+
     @abstractmethod
-    def generate_config() -> None:
-        """Выполнить генерацию конфигураций"""
+    def generate_config(
+        self,
+        variables_path: Optional[Path] = None,
+        results_path: Optional[Path] = None,
+        sites: Optional[list[str]] = None,
+    ) -> None:
+        """Выполнить генерацию конфигураций.
+
+        Args:
+            variables_path: Директория с переменными (по умолчанию settings.variables_path)
+            results_path: Директория для результатов (по умолчанию settings.results_path)
+            sites: Ограничить генерацию указанными сайтами (по умолчанию все)
+        """
         raise NotImplementedError
 
 
+def get_generator_name(gen: ConfigGenerator) -> str:
+    """Возвращает имя генератора - имя его директории в templates/."""
+    return gen.__module__.rsplit(".", 2)[-2]
+
+
 def get_generators() -> list[ConfigGenerator]:
     """Находит генераторы в templates/*/generator.py и возвращает список классов-наследников ConfigGenerator."""
     generators: list[ConfigGenerator] = []
@@ -1,13 +1,18 @@
 """Сервис для координации синхронизации репозитория и генерации кода."""
 
+from dataclasses import dataclass
+import time
+from typing import Callable, Optional
+
 from app.app_config import settings
 from app.config_generator.core import get_generators
 from app.config_generator.git_utils import (
     checkout_tracking_branch,
+    commit_current_branch,
     get_current_commit_id,
     list_remote_branches,
+    push_branches_atomic,
     sync_repo,
-    commit_and_push_current_branch,
 )
 from app.logger import get_logger
 import shutil
@@ -19,20 +24,41 @@ class GenerationError(Exception):
     """Вызывается при ошибке процесса генерации."""
 
 
-def trigger_generation() -> None:
+@dataclass
+class BranchResult:
+    """Результат обработки одной candidate-ветки."""
+
+    branch: str
+    ok: bool
+    duration: float
+    error: Optional[str] = None
+    # создан ли коммит с результатами генерации
+    committed: bool = False
+    # результат общего push: None - push ещё не выполнен или не требуется
+    pushed: Optional[bool] = None
+
+
+def trigger_generation(
+    on_branch_result: Optional[Callable[[BranchResult], None]] = None,
+) -> None:
     """Синхронизирует репозиторий, запускает генерацию и коммитит в текущую ветку.
 
+    Args:
+        on_branch_result: Опциональный обработчик, вызываемый после генерации и коммита
+            каждой ветки и повторно после push для отправленных веток
+
     Raises:
         GenerationError: Если любой этап процесса завершился с ошибкой
     """
     logger.info("Старт работы сервиса генерации конфигураций.")
     repo_path = None
     try:
-        # Синхронизация репозитория
+        # Синхронизация репозитория: только основная ветка и candidate-ветки
         repo_path = sync_repo(
             repo_url=settings.REPO_URL,
             branch=settings.REMOTE_REPO_BRANCH,
             dest_dir=settings.repo_root,
+            extra_branches=["candidate*"],
         )
         logger.info(f"Репозиторий готов в {repo_path}. Запуск генерации...")
 
@@ -42,10 +68,15 @@ def trigger_generation() -> None:
             logger.warning("Не найдено веток по маске 'candidate*'")
 
         errors: list[str] = []
+        results: list[BranchResult] = []
+        branches_to_push: list[str] = []
         generators = get_generators()
         if not generators:
             logger.warning("Не найдено ни одного генератора в templates/*/generator.py")
         for branch in candidate_branches:
+            branch_started = time.monotonic()
+            branch_error: Optional[str] = None
+            committed = False
             try:
                 logger.info(f"=== Обработка ветки {branch} ===")
                 checkout_tracking_branch(repo_path, branch)
@@ -64,15 +95,58 @@ def trigger_generation() -> None:
                         )
                 logger.info(f"Генерация успешно завершена для {branch}")
 
-                # Коммитим изменения в текущую ветку и пушим без создания release_candidate
-                commit_and_push_current_branch(
+                # Коммитим изменения в текущую ветку, push выполняется общий после цикла
+                committed = commit_current_branch(
                     repo_path,
                     message=f"Auto-generated configs for branch {branch} (from {commit_id})",
                 )
+                if committed:
+                    branches_to_push.append(branch)
             except Exception as branch_exc:
                 msg = f"Ошибка при обработке ветки {branch}: {branch_exc}"
                 logger.error(msg)
                 errors.append(msg)
+                branch_error = str(branch_exc)
+
+            result = BranchResult(
+                branch=branch,
+                ok=branch_error is None,
+                duration=time.monotonic() - branch_started,
+                error=branch_error,
+                committed=committed,
+            )
+            results.append(result)
+            if on_branch_result is not None:
+                on_branch_result(result)
+
+        # Отправляем все сгенерированные ветки одним атомарным push
+        if branches_to_push:
+            try:
+                push_results = push_branches_atomic(repo_path, branches_to_push)
+            except Exception as push_exc:
+                push_results = None
+                msg = f"Ошибка push веток {', '.join(branches_to_push)}: {push_exc}"
+                logger.error(msg)
+                errors.append(msg)
+            for result in results:
+                if result.branch not in branches_to_push:
+                    continue
+                if push_results is None:
+                    result.ok, result.pushed = False, False
+                    result.error = "push не выполнен"
+                else:
+                    ref_result = push_results[result.branch]
+                    result.pushed = ref_result.ok
+                    if ref_result.ok:
+                        logger.info(f"Push {result.branch}: {ref_result.summary}")
+                    else:
+                        msg = f"Ошибка push ветки {result.branch}: {ref_result.summary}"
+                        logger.error(msg)
+                        errors.append(msg)
+                        result.ok, result.error = False, ref_result.summary
+                # повторное уведомление только для отправленных веток
+                if on_branch_result is not None:
+                    on_branch_result(result)
 
         if errors:
             raise GenerationError("; ".join(errors))
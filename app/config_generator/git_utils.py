@@ -1,7 +1,9 @@
 """Утилиты для работы с Git репозиториями."""
 
+from dataclasses import dataclass
 import subprocess
 from pathlib import Path
+from typing import Optional
 from app.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,18 +13,34 @@ class GitError(Exception):
     """Вызывается при ошибке выполнения git операции."""
 
 
-def run_git_command(args: list[str], repo_path: Path | None = None) -> str:
+@dataclass
+class PushRefResult:
+    """Результат отправки одной ветки (строка вывода 'git push --porcelain')."""
+
+    branch: str
+    flag: str
+    summary: str
+
+    @property
+    def ok(self) -> bool:
+        return self.flag != "!"
+
+
+def run_git_command(
+    args: list[str], repo_path: Path | None = None, check: bool = True
+) -> str:
     """Выполняет git команду и возвращает её вывод.
 
     Args:
         args: Аргументы git команды (например, ['git', 'status'] или ['checkout', 'main'])
         repo_path: Опциональный путь к репозиторию. Если указан, используется 'git -C <repo_path>'
+        check: Если False, вывод возвращается и при ненулевом коде возврата
 
     Returns:
         Стандартный вывод команды в виде строки
 
     Raises:
-        GitError: Если команда завершилась с ошибкой
+        GitError: Если команда завершилась с ошибкой (при check=True)
     """
     git_args = ["git"]
     if repo_path:
@@ -33,7 +51,7 @@ def run_git_command(args: list[str], repo_path: Path | None = None) -> str:
         git_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
     )
 
-    if result.returncode != 0:
+    if check and result.returncode != 0:
         raise GitError(
             f"Ошибка выполнения git команды: {' '.join(git_args)}\n{result.stdout}"
         )
@@ -77,6 +95,30 @@ def list_remote_branches(repo_path: Path, pattern: str) -> list[str]:
     return branches
 
 
+def fetch_branches(
+    repo_path: Path, branches: list[str], remote: str = "origin"
+) -> None:
+    """Забирает только указанные ветки явными refspec'ами.
+
+    Каждая ветка обновляется в refs/remotes/<remote>/<branch>; остальные ветки
+    и теги не запрашиваются. Вместо имени можно передать glob-шаблон с одной
+    '*' (например 'candidate*'): такой refspec не падает, если подходящих веток
+    нет, а --prune удаляет локальные ссылки на удалённые на сервере ветки.
+
+    Args:
+        repo_path: Путь к репозиторию
+        branches: Имена веток или glob-шаблоны для получения
+        remote: Имя удалённого репозитория (по умолчанию: origin)
+    """
+    if not branches:
+        return
+    refspecs = [
+        f"+refs/heads/{name}:refs/remotes/{remote}/{name}"
+        for name in dict.fromkeys(branches)
+    ]
+    run_git_command(["fetch", "--prune", "--no-tags", remote, *refspecs], repo_path)
+
+
 def checkout_tracking_branch(repo_path: Path, branch: str) -> None:
     """Переключается на локальную ветку, отслеживающую origin/<branch>.
 
@@ -89,34 +131,51 @@ def sync_repo(
     repo_url: str,
     branch: str,
     dest_dir: Path,
+    extra_branches: Optional[list[str]] = None,
 ) -> Path:
     """Синхронизирует или клонирует git репозиторий.
 
+    Забираются только ветка branch и ветки из extra_branches (см. fetch_branches).
+
     Args:
         repo_url: URL удалённого репозитория
         branch: Имя ветки для checkout
         dest_dir: Локальный путь к директории репозитория
+        extra_branches: Дополнительные ветки или glob-шаблоны (например, 'candidate*')
 
     Returns:
         Путь к синхронизированному репозиторию
     """
     dest_path = Path(dest_dir)
+    extra = [name for name in (extra_branches or []) if name != branch]
 
     if (dest_path / ".git").exists():
         logger.info(f"Синхронизация существующего репозитория в {dest_path}...")
-        # Забираем все ветки и теги
-        run_git_command(["fetch", "--all", "--prune"], dest_path)
-        run_git_command(["checkout", branch], dest_path)
+        fetch_branches(dest_path, [branch, *extra])
+        run_git_command(["checkout", "-f", branch], dest_path)
         run_git_command(["reset", "--hard", f"origin/{branch}"], dest_path)
+        # Удаляем неотслеживаемые файлы прерванного запуска (например, *.tmp
+        # рендеринга), иначе 'git add -A' закоммитит их в candidate-ветку
+        run_git_command(["clean", "-fdx"], dest_path)
     else:
         if not dest_path.exists():
             dest_path.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Клонирование {repo_url} (ветка {branch}) в {dest_path}")
-        # Клонируем репозиторий с полной историей и всеми ветками
-        run_git_command(["clone", "--branch", branch, repo_url, dest_path.as_posix()])
-        # Сразу обновляем все ссылки и ветки
-        run_git_command(["fetch", "--all", "--prune"], dest_path)
+        # Клонируем только основную ветку, без тегов
+        run_git_command(
+            [
+                "clone",
+                "--single-branch",
+                "--no-tags",
+                "--branch",
+                branch,
+                repo_url,
+                dest_path.as_posix(),
+            ]
+        )
+        # Догружаем только нужные ветки
+        fetch_branches(dest_path, extra)
 
     return dest_path
 
@@ -181,6 +240,65 @@ def get_current_branch(repo_path: Path) -> str:
     return run_git_command(["rev-parse", "--abbrev-ref", "HEAD"], repo_path)
 
 
+def push_branches_atomic(
+    repo_path: Path, branches: list[str], remote: str = "origin"
+) -> dict[str, PushRefResult]:
+    """Отправляет несколько веток одним 'git push --atomic'.
+
+    Либо обновляются все ветки, либо ни одна. Результат разбирается из
+    вывода '--porcelain' отдельно для каждой ветки.
+
+    Args:
+        repo_path: Путь к репозиторию
+        branches: Имена веток для отправки
+        remote: Имя удалённого репозитория (по умолчанию: origin)
+
+    Returns:
+        Словарь {имя ветки: PushRefResult}
+
+    Raises:
+        GitError: Если push завершился ошибкой без результатов по веткам (например, сеть)
+    """
+    if not branches:
+        return {}
+    refspecs = [f"refs/heads/{name}:refs/heads/{name}" for name in branches]
+    output = run_git_command(
+        ["push", "--atomic", "--porcelain", remote, *refspecs], repo_path, check=False
+    )
+
+    results: dict[str, PushRefResult] = {}
+    for line in output.splitlines():
+        # формат: <flag>\t<from>:<to>\t<summary>
+        parts = line.split("\t")
+        if len(parts) != 3 or len(parts[0]) != 1 or ":" not in parts[1]:
+            continue
+        dst = parts[1].split(":", 1)[1]
+        name = dst[len("refs/heads/") :] if dst.startswith("refs/heads/") else dst
+        results[name] = PushRefResult(branch=name, flag=parts[0], summary=parts[2])
+
+    missing = [name for name in branches if name not in results]
+    if missing:
+        raise GitError(f"Ошибка push {', '.join(missing)} в {remote}:\n{output}")
+    return results
+
+
+def commit_current_branch(repo_path: Path, message: str) -> bool:
+    """Коммитит все изменения в текущую ветку, если они есть.
+
+    Args:
+        repo_path: Путь к репозиторию
+        message: Сообщение коммита
+
+    Returns:
+        True если коммит создан, False если изменений нет
+    """
+    if not has_changes(repo_path):
+        logger.info("Нет изменений для коммита")
+        return False
+    commit_all_changes(repo_path, message)
+    return True
+
+
 def commit_and_push_current_branch(
     repo_path: Path, message: str, remote: str = "origin"
 ) -> None:
@@ -191,10 +309,9 @@ def commit_and_push_current_branch(
         message: Сообщение коммита
         remote: Имя удалённого репозитория (по умолчанию: origin)
     """
-    if not has_changes(repo_path):
+    if not commit_current_branch(repo_path, message):
         logger.info("Нет изменений для коммита, пропускаем отправку")
         return
-    commit_all_changes(repo_path, message)
     current_branch = get_current_branch(repo_path)
     push_branch(repo_path, current_branch, remote)
     logger.info(f"Push commit with comment: {message}")
@@ -1,9 +1,22 @@
+from functools import lru_cache
+import hashlib
+import os
 from pathlib import Path
+import re
+import uuid
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
 
+# размер буфера файла при потоковой записи результата рендеринга
+WRITE_BUFFER_SIZE = 1024 * 1024
 
-def render_template(template_dir: Path, template_name: str, context: dict) -> str:
+# имя временного файла render_template_to_file: .<имя>.<uuid4 hex>.tmp
+_TEMP_FILE_RE = re.compile(r"\..+\.[0-9a-f]{32}\.tmp")
+
+
+@lru_cache(maxsize=None)
+def _get_template(template_dir: Path, template_name: str) -> Template:
+    # шаблон компилируется один раз на процесс, а не для каждого сайта
     env = Environment(
         loader=FileSystemLoader(str(template_dir)),
         undefined=StrictUndefined,
@@ -11,5 +24,86 @@ def render_template(template_dir: Path, template_name: str, context: dict) -> st
         lstrip_blocks=True,
         autoescape=False,
     )
-    template = env.get_template(template_name)
+    return env.get_template(template_name)
+
+
+def remove_stale_temp_files(directory: Path) -> int:
+    """Удаляет временные файлы render_template_to_file, оставшиеся после прерванного запуска.
+
+    Вызывается один раз перед генерацией, пока в директорию никто не пишет.
+
+    Returns:
+        Количество удалённых файлов
+    """
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for entry in directory.iterdir():
+        if _TEMP_FILE_RE.fullmatch(entry.name) and entry.is_file():
+            entry.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def render_template(template_dir: Path, template_name: str, context: dict) -> str:
+    template = _get_template(template_dir, template_name)
     return template.render(**context)
+
+
+def render_template_to_file(
+    template_dir: Path,
+    template_name: str,
+    context: dict,
+    output_path: Path,
+) -> str:
+    """Потоково рендерит шаблон в файл и возвращает sha256 записанного содержимого.
+
+    Результат не собирается в одну строку: фрагменты из template.generate()
+    сразу пишутся в буферизованный файл. Пробельные символы в конце вывода
+    отбрасываются, файл всегда заканчивается одним переводом строки
+    (аналогично rendered.rstrip() + "\\n").
+
+    Запись идёт во временный файл в той же директории, который заменяет
+    output_path только после успешного рендеринга: при ошибке шаблона
+    прежний файл остаётся нетронутым. Если процесс убит во время записи,
+    временный файл остаётся и удаляется remove_stale_temp_files().
+
+    Args:
+        template_dir: Директория с шаблонами
+        template_name: Имя шаблона
+        context: Переменные для шаблона
+        output_path: Путь к файлу результата
+
+    Returns:
+        Hex-строка sha256 содержимого файла
+    """
+    template = _get_template(template_dir, template_name)
+    digest = hashlib.sha256()
+    # пробельный "хвост", который пишется только если за ним последует непробельный текст
+    pending = ""
+
+    # "x" вместо mkstemp: права файла определяются umask, как у обычного open()
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp_path.open(
+            "x", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER_SIZE
+        ) as f:
+
+            def write(data: str) -> None:
+                f.write(data)
+                digest.update(data.encode("utf-8"))
+
+            for chunk in template.generate(**context):
+                stripped = chunk.rstrip()
+                if not stripped:
+                    pending += chunk
+                    continue
+                write(pending + stripped)
+                pending = chunk[len(stripped) :]
+            write("\n")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return digest.hexdigest()
@@ -1,8 +1,8 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from app.config_generator.io_utils import ensure_dir, list_all_sites
-from app.config_generator.render import render_template
+from app.config_generator.render import render_template_to_file
 from app.app_config import settings
 from app.logger import get_logger
 
@@ -19,6 +19,11 @@ class NTPServer:
 
 
 class Generator(ConfigGenerator):
+    input_globs = [
+        f"{settings.VARIABLES_DIR}/ntp_servers/*/ntp_servers.txt",
+    ]
+    output_globs = ["NTP_servers_*.txt"]
+
     def _read_ntp_servers(self, file_path: Path) -> List[NTPServer]:
         entries: List[NTPServer] = []
         if not file_path.exists():
@@ -54,36 +59,50 @@ class Generator(ConfigGenerator):
                 "ntp_servers": ntp_servers,
             }
 
-            rendered = render_template(
-                template_dir=template_dir,
-                template_name=template_name,
-                context=context,
-            )
-
             final_name = f"NTP_servers_{site}.txt"
 
             output_path = Path(final_name)
             if not output_path.is_absolute():
                 output_path = results_dir / output_path
 
-            with output_path.open("w", encoding="utf-8", newline="\n") as f:
-                f.write(rendered.rstrip() + "\n")
+            digest = render_template_to_file(
+                template_dir=template_dir,
+                template_name=template_name,
+                context=context,
+                output_path=output_path,
+            )
+
+            logger.info(
+                f"Rendered configuration written to: {output_path} (sha256 {digest})"
+            )
 
-            logger.info(f"Rendered configuration written to: {output_path}")
+    def generate_config(
+        self,
+        variables_path: Optional[Path] = None,
+        results_path: Optional[Path] = None,
+        sites: Optional[List[str]] = None,
+    ) -> None:
+        """Генерация конфигурации для всех сайтов.
 
-    def generate_config(self) -> None:
-        """Генерация конфигурации для всех сайтов."""
+        Args:
+            variables_path: Директория с переменными (по умолчанию settings.variables_path)
+            results_path: Директория для результатов (по умолчанию settings.results_path)
+            sites: Ограничить генерацию указанными сайтами
+        """
         variables_file = "ntp_servers.txt"
-        results_dir = settings.results_path
+        results_dir = results_path or settings.results_path
         ensure_dir(results_dir)
 
-        variables_ntp_servers_dir = settings.variables_path / "ntp_servers/"
-        sites: List[str] = list_all_sites(variables_ntp_servers_dir)
-        if not sites:
+        variables_ntp_servers_dir = (
+            variables_path or settings.variables_path
+        ) / "ntp_servers/"
+        selected = set(sites) if sites is not None else None
+        all_sites: List[str] = list_all_sites(variables_ntp_servers_dir)
+        if not all_sites:
             logger.warning(f"No sites found under: {variables_ntp_servers_dir}")
             return
         self._generate_for_sites(
-            sites=sites,
+            sites=[site for site in all_sites if selected is None or site in selected],
             variables_file=variables_file,
             results_dir=results_dir,
             template_dir=Path(__file__).resolve().parent,
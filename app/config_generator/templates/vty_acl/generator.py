@@ -1,8 +1,8 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from app.config_generator.io_utils import ensure_dir, list_all_sites
-from app.config_generator.render import render_template
+from app.config_generator.render import render_template_to_file
 from app.app_config import settings
 from app.logger import get_logger
 
@@ -19,21 +19,38 @@ class AclEntry:
 
 
 class Generator(ConfigGenerator):
-    def generate_config(self) -> None:
-        """Генерация VTY ACL для всех сайтов."""
+    input_globs = [
+        f"{settings.VARIABLES_DIR}/vty_ACL/*/acl_ssh_dc.txt",
+    ]
+    output_globs = ["vty_ACL_*.txt"]
+
+    def generate_config(
+        self,
+        variables_path: Optional[Path] = None,
+        results_path: Optional[Path] = None,
+        sites: Optional[List[str]] = None,
+    ) -> None:
+        """Генерация VTY ACL для всех сайтов.
+
+        Args:
+            variables_path: Директория с переменными (по умолчанию settings.variables_path)
+            results_path: Директория для результатов (по умолчанию settings.results_path)
+            sites: Ограничить генерацию указанными сайтами
+        """
         variables_file = "acl_ssh_dc.txt"
-        results_dir = settings.results_path
+        results_dir = results_path or settings.results_path
         ensure_dir(results_dir)
 
-        variables_vty_acl_dir = settings.variables_path / "vty_ACL/"
-        sites: List[str] = list_all_sites(variables_vty_acl_dir)
-        if not sites:
+        variables_vty_acl_dir = (variables_path or settings.variables_path) / "vty_ACL/"
+        selected = set(sites) if sites is not None else None
+        all_sites: List[str] = list_all_sites(variables_vty_acl_dir)
+        if not all_sites:
             # raise FileNotFoundError(
             #     f"No sites found under: {variables_vty_acl_dir}"
             # )
             logger.warning(f"No sites found under: {variables_vty_acl_dir}")
         self._generate_for_sites(
-            sites=sites,
+            sites=[site for site in all_sites if selected is None or site in selected],
             variables_file=variables_file,
             results_dir=results_dir,
             template_dir=Path(__file__).resolve().parent,
@@ -78,19 +95,19 @@ class Generator(ConfigGenerator):
                 "acl_ssh_dc": acl_entries,
             }
 
-            rendered = render_template(
-                template_dir=template_dir,
-                template_name=template_name,
-                context=context,
-            )
-
             final_name = f"vty_ACL_{site}.txt"
 
             output_path = Path(final_name)
             if not output_path.is_absolute():
                 output_path = results_dir / output_path
 
-            with output_path.open("w", encoding="utf-8", newline="\n") as f:
-                f.write(rendered.rstrip() + "\n")
+            digest = render_template_to_file(
+                template_dir=template_dir,
+                template_name=template_name,
+                context=context,
+                output_path=output_path,
+            )
 
-            logger.info(f"Rendered configuration written to: {output_path}")
+            logger.info(
+                f"Rendered configuration written to: {output_path} (sha256 {digest})"
+            )
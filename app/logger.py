@@ -2,23 +2,26 @@
 
 import logging
 import sys
+from typing import TextIO
 
 from app.app_config import settings
 
 
-def setup_logging(level: int = logging.INFO) -> None:
+def setup_logging(level: int = logging.INFO, stream: TextIO = sys.stdout) -> None:
     """Настраивает логирование для приложения.
 
     Args:
         level: Уровень логирования (по умолчанию INFO)
+        stream: Поток для вывода логов (по умолчанию stdout)
     """
+    settings.temp_dir.mkdir(parents=True, exist_ok=True)
 
     logging.basicConfig(
         level=level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
         handlers=[
-            logging.StreamHandler(sys.stdout),
+            logging.StreamHandler(stream),
             logging.FileHandler(settings.temp_dir / "app.log"),
         ],
         force=True,
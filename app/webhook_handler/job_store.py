@@ -0,0 +1,303 @@
+"""Хранилище задач генерации в SQLite и фоновый обработчик очереди."""
+
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from app.config_generator.generation_service import BranchResult
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# состояния задачи
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# максимальное количество запусков задачи, прерванной перезапуском процесса
+MAX_JOB_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    state TEXT NOT NULL,
+    ref TEXT,
+    event TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    branches TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS jobs_state_idx ON jobs (state, id);
+"""
+
+
+@dataclass
+class Job:
+    """Задача генерации, запущенная вебхуком."""
+
+    id: int
+    state: str
+    ref: Optional[str]
+    event: Optional[str]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    branches: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Время ожидания в очереди (секунды) до начала последнего запуска."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.created_at
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Время выполнения (секунды) последнего запуска."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["queue_wait"] = self.queue_wait
+        data["duration"] = self.duration
+        return data
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    data = dict(row)
+    data["branches"] = json.loads(data["branches"] or "{}")
+    return Job(**data)
+
+
+class JobStore:
+    """Очередь задач генерации в SQLite.
+
+    Каждая операция открывает собственное соединение, поэтому экземпляр можно
+    использовать одновременно из обработчиков FastAPI и из потока JobWorker.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path.as_posix(), timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create_job(self, ref: Optional[str], event: Optional[str]) -> int:
+        """Добавляет задачу в очередь и возвращает её ID."""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (state, ref, event, created_at) VALUES (?, ?, ?, ?)",
+                (JOB_PENDING, ref, event, time.time()),
+            )
+            return cursor.lastrowid
+
+    def claim_next(self) -> Optional[Job]:
+        """Переводит самую старую ожидающую задачу в состояние running и возвращает её."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE state = ? ORDER BY id LIMIT 1",
+                (JOB_PENDING,),
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, started_at = ?, finished_at = NULL, "
+                "attempts = attempts + 1, error = NULL, branches = '{}' WHERE id = ?",
+                (JOB_RUNNING, time.time(), row["id"]),
+            )
+            job = conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (row["id"],)
+            ).fetchone()
+            conn.commit()
+            return _row_to_job(job)
+
+    def record_branch_result(self, job_id: int, result: BranchResult) -> None:
+        """Сохраняет результат обработки ветки в задаче."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT branches FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return
+            branches = json.loads(row["branches"] or "{}")
+            outcome = asdict(result)
+            branches[outcome.pop("branch")] = outcome
+            conn.execute(
+                "UPDATE jobs SET branches = ? WHERE id = ?",
+                (json.dumps(branches, ensure_ascii=False), job_id),
+            )
+            conn.commit()
+
+    def finish_job(self, job_id: int, error: Optional[str] = None) -> None:
+        """Завершает задачу: done при отсутствии ошибки, иначе failed."""
+        state = JOB_DONE if error is None else JOB_FAILED
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE id = ?",
+                (state, time.time(), error, job_id),
+            )
+
+    def requeue_interrupted(self, max_attempts: int = MAX_JOB_ATTEMPTS) -> int:
+        """Возвращает в очередь задачи, прерванные перезапуском процесса.
+
+        Задачи, уже запускавшиеся max_attempts раз, помечаются failed, чтобы
+        задача, роняющая процесс, не перезапускалась бесконечно.
+
+        Args:
+            max_attempts: Максимальное количество запусков задачи
+
+        Returns:
+            Количество возвращённых в очередь задач
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, error = ? "
+                "WHERE state = ? AND attempts >= ?",
+                (
+                    JOB_FAILED,
+                    time.time(),
+                    f"Задача прервана {max_attempts} раз(а), повторы прекращены",
+                    JOB_RUNNING,
+                    max_attempts,
+                ),
+            )
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ? WHERE state = ?",
+                (JOB_PENDING, JOB_RUNNING),
+            )
+            return cursor.rowcount
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list_jobs(self, state: Optional[str] = None, limit: int = 50) -> list[Job]:
+        """Возвращает последние задачи (новые первыми), опционально по состоянию."""
+        query = "SELECT * FROM jobs"
+        params: list = []
+        if state:
+            query += " WHERE state = ?"
+            params.append(state)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def count_by_state(self) -> dict[str, int]:
+        """Возвращает количество задач в каждом состоянии."""
+        counts = {JOB_PENDING: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"
+            ).fetchall()
+        for row in rows:
+            counts[row["state"]] = row["n"]
+        return counts
+
+
+class JobWorker:
+    """Фоновый поток, последовательно выполняющий задачи из JobStore.
+
+    Задачи выполняются строго по одной: все они работают с общим локальным
+    клоном settings.repo_root.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run_job: Callable[[Callable[[BranchResult], None]], None],
+        poll_interval: float = 5.0,
+    ):
+        self.store = store
+        self.run_job = run_job
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="job-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Останавливает поток после завершения текущей задачи.
+
+        Незавершённая задача останется в состоянии running и будет возвращена
+        в очередь при следующем запуске (requeue_interrupted).
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self) -> None:
+        """Сообщает потоку о новой задаче в очереди."""
+        self._wakeup.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                job = self.store.claim_next()
+                if job is not None:
+                    self._execute(job)
+                    continue
+            except Exception as exc:
+                # ошибка хранилища не должна останавливать поток
+                logger.error(f"Ошибка обработчика очереди задач: {exc}")
+            self._wakeup.wait(self.poll_interval)
+
+    def _record_branch_result(self, job_id: int, result: BranchResult) -> None:
+        # ошибка записи прогресса не должна прерывать генерацию
+        try:
+            self.store.record_branch_result(job_id, result)
+        except Exception as exc:
+            logger.warning(
+                f"Не удалось сохранить результат ветки {result.branch} "
+                f"задачи {job_id}: {exc}"
+            )
+
+    def _execute(self, job: Job) -> None:
+        logger.info(
+            f"Задача {job.id} (ref {job.ref}) запущена, "
+            f"ожидание в очереди {job.queue_wait:.2f} с"
+        )
+        error: Optional[str] = None
+        try:
+            self.run_job(lambda result: self._record_branch_result(job.id, result))
+        except Exception as exc:
+            error = str(exc)
+        self.store.finish_job(job.id, error)
+        if error:
+            logger.error(f"Задача {job.id} завершилась ошибкой: {error}")
+        else:
+            logger.info(f"Задача {job.id} успешно завершена")
@@ -1,5 +1,6 @@
 """FastAPI webhook endpoint для запуска генерации кода."""
 
+from contextlib import asynccontextmanager
 from typing import Optional
 import uvicorn
 
@@ -13,23 +14,44 @@ if __package__ is None or __package__ == "":
     if project_root_str not in sys.path:
         sys.path.insert(0, project_root_str)
 
-from fastapi import FastAPI, Header, BackgroundTasks
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.responses import PlainTextResponse
 
+from app.app_config import settings
 from app.config_generator.generation_service import trigger_generation
+from app.logger import get_logger
+from app.webhook_handler.job_store import JOB_PENDING, JobStore, JobWorker
 from app.webhook_handler.webhook_validator import (
     extract_ref,
     is_allowed_branch,
     is_git_event,
+    push_affects_generators,
 )
 
+logger = get_logger(__name__)
 
-app = FastAPI()
+job_store = JobStore(settings.jobs_db_path)
+job_worker = JobWorker(job_store, trigger_generation)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # задачи, прерванные перезапуском, снова ставятся в очередь
+    requeued = job_store.requeue_interrupted()
+    if requeued:
+        logger.info(f"Возвращено в очередь прерванных задач: {requeued}")
+    job_worker.start()
+    yield
+    job_worker.stop(timeout=5)
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# обработчики синхронные: FastAPI выполняет их в пуле потоков, поэтому
+# блокирующие обращения к SQLite и compare API не останавливают event loop
 @app.post("/webhook", response_class=PlainTextResponse)
-async def webhook(
-    background_tasks: BackgroundTasks,
+def webhook(
     payload: Optional[dict] = None,
     x_gitlab_event: Optional[str] = Header(default=None, alias="X-Gitlab-Event"),
     x_github_event: Optional[str] = Header(default=None, alias="X-GitHub-Event"),
@@ -39,8 +61,9 @@ async def webhook(
     Проверяет что:
     - Запрос от Git сервиса (имеет заголовок X-Gitlab-Event или X-GitHub-Event)
     - Запрос для настроенной ветки по умолчанию
+    - Изменённые файлы затрагивают входные данные генераторов
 
-    Если всё валидно, запускает генерацию в фоновом режиме.
+    Если всё валидно, ставит задачу генерации в очередь (см. GET /jobs/{id}).
     """
     # Проверка что запрос от Git сервиса
     if not is_git_event(x_gitlab_event, x_github_event):
@@ -51,9 +74,37 @@ async def webhook(
     if not is_allowed_branch(ref):
         return PlainTextResponse(f"Ветка {ref} игнорируется\n", status_code=202)
 
-    # Запуск генерации в фоне
-    background_tasks.add_task(trigger_generation)
-    return PlainTextResponse("OK\n", status_code=200)
+    # Проверка изменённых путей до любых git операций
+    if not push_affects_generators(payload):
+        return PlainTextResponse(
+            "Изменения не затрагивают входные данные генераторов\n", status_code=202
+        )
+
+    # Постановка задачи генерации в очередь
+    job_id = job_store.create_job(ref, x_gitlab_event or x_github_event)
+    job_worker.notify()
+    return PlainTextResponse(f"OK, задача {job_id}\n", status_code=200)
+
+
+@app.get("/jobs")
+def list_jobs(state: Optional[str] = None, limit: int = 50):
+    """Возвращает размер очереди и последние задачи генерации."""
+    counts = job_store.count_by_state()
+    jobs = job_store.list_jobs(state=state, limit=limit)
+    return {
+        "queue_depth": counts[JOB_PENDING],
+        "counts": counts,
+        "jobs": [job.to_dict() for job in jobs],
+    }
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: int):
+    """Возвращает состояние, тайминги и результаты по веткам одной задачи."""
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Задача {job_id} не найдена")
+    return job.to_dict()
 
 
 if __name__ == "__main__":
@@ -72,3 +123,8 @@ curl -X POST http://localhost:8080/webhook \
   -H 'X-Gitlab-Event: Push Hook' \
   -d '{"ref":"refs/heads/main"}'
 """
+
+"""
+curl http://localhost:8080/jobs
+curl http://localhost:8080/jobs/1
+"""
@@ -1,8 +1,25 @@
 """Утилиты для валидации payload webhook запросов."""
 
-from typing import Optional
+import fnmatch
+import json
+import re
+from typing import Iterable, Optional
+from urllib.parse import quote, urlsplit
+from urllib.request import HTTPRedirectHandler, Request, build_opener
 
 from app.app_config import settings
+from app.config_generator.core import get_generators
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# GitHub передаёт в push payload не более 20 коммитов
+GITHUB_MAX_PAYLOAD_COMMITS = 20
+# таймаут запроса списка изменений к API GitLab/GitHub, секунды
+COMPARE_API_TIMEOUT = 10
+NULL_SHA = "0" * 40
+# SHA коммита (SHA-1 или SHA-256)
+SHA_RE = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
 
 
 def is_git_event(x_gitlab_event: Optional[str], x_github_event: Optional[str]) -> bool:
@@ -46,3 +63,171 @@ def is_allowed_branch(ref: Optional[str]) -> bool:
 
     default_branch = settings.REMOTE_REPO_BRANCH
     return ref in (f"refs/heads/{default_branch}", default_branch)
+
+
+def extract_changed_paths(payload: Optional[dict]) -> Optional[set[str]]:
+    """Извлекает изменённые пути из commits[].added/modified/removed push payload.
+
+    Args:
+        payload: Словарь с данными webhook запроса GitLab/GitHub
+
+    Returns:
+        Множество путей или None, если список коммитов отсутствует или усечён
+    """
+    if not isinstance(payload, dict):
+        return None
+    commits = payload.get("commits")
+    if not isinstance(commits, list) or not commits:
+        return None
+
+    # GitLab: total_commits_count больше числа коммитов в payload
+    total = payload.get("total_commits_count")
+    if isinstance(total, int) and total > len(commits):
+        return None
+    # GitHub: число коммитов в payload ограничено
+    if total is None and len(commits) >= GITHUB_MAX_PAYLOAD_COMMITS:
+        return None
+
+    paths: set[str] = set()
+    for commit in commits:
+        if not isinstance(commit, dict):
+            return None
+        for key in ("added", "modified", "removed"):
+            files = commit.get(key)
+            if files is None:
+                continue
+            if not isinstance(files, list):
+                return None
+            paths.update(f for f in files if isinstance(f, str))
+    return paths
+
+
+class _NoRedirectHandler(HTTPRedirectHandler):
+    """Запрещает редиректы, чтобы токен не ушёл на другой хост."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def _compare_api_url(before: str, after: str) -> Optional[str]:
+    """Строит URL compare API по settings.REPO_URL (https-хост и путь проекта).
+
+    Данные из payload, кроме SHA коммитов, в URL не попадают: адрес
+    определяется только конфигурацией. Для github.com используется
+    api.github.com, для остальных хостов - API GitLab на том же хосте.
+
+    Returns:
+        URL или None, если REPO_URL не https или SHA некорректны
+    """
+    if not (SHA_RE.fullmatch(before) and SHA_RE.fullmatch(after)):
+        return None
+    parts = urlsplit(settings.REPO_URL)
+    project = parts.path.strip("/").removesuffix(".git")
+    if parts.scheme != "https" or not parts.hostname or not project:
+        return None
+
+    if parts.hostname == "github.com":
+        return f"https://api.github.com/repos/{project}/compare/{before}...{after}"
+    return (
+        f"https://{parts.netloc.rpartition('@')[2]}/api/v4/projects/"
+        f"{quote(project, safe='')}/repository/compare?from={before}&to={after}"
+    )
+
+
+def _compare_api_request(url: str) -> dict:
+    headers = {"Accept": "application/json"}
+    if settings.GIT_API_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.GIT_API_TOKEN}"
+    opener = build_opener(_NoRedirectHandler)
+    with opener.open(
+        Request(url, headers=headers), timeout=COMPARE_API_TIMEOUT
+    ) as resp:
+        return json.load(resp)
+
+
+def fetch_changed_paths(payload: Optional[dict]) -> Optional[set[str]]:
+    """Запрашивает список изменённых файлов у сервера (compare API GitLab/GitHub).
+
+    Используется, когда список путей в payload усечён. Клонирование не требуется.
+    Из payload берутся только SHA before/after, адрес API строится по
+    settings.REPO_URL.
+
+    Args:
+        payload: Словарь с данными webhook запроса GitLab/GitHub
+
+    Returns:
+        Множество путей или None, если сравнение выполнить не удалось
+    """
+    if not isinstance(payload, dict):
+        return None
+    before, after = payload.get("before"), payload.get("after")
+    if not isinstance(before, str) or not isinstance(after, str):
+        return None
+    if NULL_SHA in (before, after):
+        return None
+    url = _compare_api_url(before, after)
+    if url is None:
+        return None
+
+    try:
+        data = _compare_api_request(url)
+        paths: set[str] = set()
+        if "diffs" in data:
+            # GitLab
+            for diff in data["diffs"]:
+                paths.update(
+                    p for p in (diff.get("old_path"), diff.get("new_path")) if p
+                )
+            return paths
+        # GitHub
+        files = data.get("files", [])
+        # GitHub возвращает не более 300 файлов
+        if len(files) >= 300:
+            return None
+        for item in files:
+            paths.update(
+                p for p in (item.get("filename"), item.get("previous_filename")) if p
+            )
+        return paths
+    except Exception as exc:
+        logger.warning(f"Не удалось получить список изменений через API: {exc}")
+    return None
+
+
+def paths_match_globs(paths: Iterable[str], globs: Iterable[str]) -> bool:
+    """Проверяет, соответствует ли хотя бы один путь хотя бы одному glob-шаблону."""
+    globs = list(globs)
+    return any(
+        fnmatch.fnmatchcase(path, pattern) for path in paths for pattern in globs
+    )
+
+
+def push_affects_generators(payload: Optional[dict]) -> bool:
+    """Проверяет, может ли push изменить результат хотя бы одного генератора.
+
+    Пути берутся из payload, при усечённом payload — из compare API сервера.
+    Учитываются input_globs генераторов и их результаты (output_globs в
+    директории результатов). Если список изменений получить не удалось или
+    генератор не объявил input_globs, push считается влияющим на результат.
+
+    Args:
+        payload: Словарь с данными webhook запроса
+
+    Returns:
+        False если изменённые пути не затрагивают входные данные генераторов
+    """
+    paths = extract_changed_paths(payload)
+    if paths is None:
+        paths = fetch_changed_paths(payload)
+    if paths is None:
+        return True
+
+    globs: list[str] = []
+    for gen in get_generators():
+        if gen.input_globs is None:
+            return True
+        globs.extend(gen.input_globs)
+        globs.extend(
+            f"{settings.RESULTS_DIR}/{pattern}" for pattern in gen.output_globs
+        )
+    return paths_match_globs(paths, globs)